@@ -0,0 +1,84 @@
+"""Report transferred bytes per page before and after the asset pipeline.
+
+"Before" is the uncompressed HTML plus the original static CSS/JS it links;
+"after" is the HTML as compressed on the fly plus the minified, precompressed
+fingerprinted assets the browser actually downloads.
+
+    python benchmarks/asset_savings.py
+"""
+import os
+import re
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+from datetime import datetime
+
+from utils.assets import build_assets, brotli
+
+PAGES = ['/', '/search?q=post', '/login', '/register']
+ASSET_RE = re.compile(r'(?:href|src)="(/static/[^"]+\.(?:css|js))"')
+
+
+def seed(db, User, Post):
+    user = User(username='bench', email='bench@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+    for i in range(20):
+        db.session.add(Post(
+            title=f'Benchmark post {i}', slug=f'benchmark-post-{i}',
+            content='<p>' + 'Lorem ipsum dolor sit amet. ' * 40 + '</p>',
+            excerpt='A short excerpt for the listing page.', category='technology',
+            is_published=True, published_at=datetime.utcnow(), user_id=user.id
+        ))
+    db.session.commit()
+
+
+def served_size(app, url, encoding):
+    """Bytes the client receives for a fingerprinted asset"""
+    path = os.path.join(app.static_folder, url[len('/static/'):])
+    suffix = {'br': '.br', 'gzip': '.gz'}.get(encoding, '')
+    return os.path.getsize(path + suffix)
+
+
+def main():
+    from app import create_app
+    from database import db, User, Post
+
+    static_folder = os.path.join(ROOT, 'static')
+    build_assets(static_folder, os.path.join(static_folder, 'dist'))
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(db, User, Post)
+
+    encoding = 'br' if brotli is not None else 'gzip'
+    client = app.test_client()
+    print(f'{"page":<18} {"html":>8} {"html " + encoding:>10} {"assets":>8} {"assets " + encoding:>12} '
+          f'{"before":>8} {"after":>8} {"saved":>7}')
+
+    for page in PAGES:
+        raw = client.get(page)
+        compressed = client.get(page, headers={'Accept-Encoding': encoding})
+        html = raw.get_data(as_text=True)
+
+        # Source files referenced by the page, resolved through the manifest
+        source_bytes = after_bytes = 0
+        for url in ASSET_RE.findall(html):
+            built = url.split('/static/dist/', 1)[-1]
+            source = re.sub(r'\.[0-9a-f]{12}(\.\w+)$', r'\1', built)
+            source_bytes += os.path.getsize(os.path.join(static_folder, source))
+            after_bytes += served_size(app, url, encoding)
+
+        before = len(raw.data) + source_bytes
+        after = len(compressed.data) + after_bytes
+        print(f'{page:<18} {len(raw.data):>8} {len(compressed.data):>10} {source_bytes:>8} '
+              f'{after_bytes:>12} {before:>8} {after:>8} {1 - after / before:>7.1%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Home timeline cost under hybrid fan-out.
+
+Seeds a synthetic follow graph (Zipf-distributed popularity, so a handful of
+authors collect tens of thousands of followers), then reports:
+
+* write amplification: timeline rows written per published post, hybrid
+  versus pushing every post to every follower, with publish latency
+* read latency: first feed page for random users, hybrid versus pulling
+  every followed author's posts at read time
+
+    python benchmarks/feed_fanout.py [--users 100000] [--follows 20] [--posts 50000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+from sqlalchemy import insert, select
+
+CHUNK = 10000
+
+
+def seed(db, models, args, rng, threshold):
+    """Users, follows, stats, posts and the timelines fan-out on write would have built"""
+    User, Post, Follow, TimelineEntry, UserStats = models
+    now = datetime.utcnow()
+
+    user_ids = [str(uuid.uuid4()) for _ in range(args.users)]
+    for start in range(0, args.users, CHUNK):
+        db.session.execute(User.__table__.insert(), [
+            {'id': user_id, 'username': f'user{start + i}', 'email': f'user{start + i}@example.com',
+             'password_hash': 'x', 'created_at': now}
+            for i, user_id in enumerate(user_ids[start:start + CHUNK])
+        ])
+
+    # Popularity follows a Zipf law: the k-th most popular author is picked
+    # roughly 1/k as often as the first
+    cum_weights = list(accumulate(1 / rank for rank in range(1, args.users + 1)))
+    followers = Counter()
+    for start in range(0, args.users, CHUNK):
+        rows = []
+        for follower in range(start, min(start + CHUNK, args.users)):
+            followees = set(rng.choices(range(args.users), cum_weights=cum_weights, k=args.follows))
+            followees.discard(follower)
+            followers.update(followees)
+            rows.extend({'id': str(uuid.uuid4()), 'follower_id': user_ids[follower],
+                         'followee_id': user_ids[followee], 'created_at': now}
+                        for followee in followees)
+        db.session.execute(Follow.__table__.insert(), rows)
+
+    db.session.execute(UserStats.__table__.insert(), [
+        {'user_id': user_id, 'post_count': 0, 'published_count': 0, 'total_views': 0,
+         'total_likes': 0, 'follower_count': followers[i]}
+        for i, user_id in enumerate(user_ids)
+    ])
+
+    for start in range(0, args.posts, CHUNK):
+        db.session.execute(Post.__table__.insert(), [
+            {'id': str(uuid.uuid4()), 'title': f'Post {i}', 'slug': f'post-{i}', 'content': 'x',
+             'excerpt': 'x', 'is_published': True, 'views': 0, 'trending_score': 0,
+             'user_id': rng.choice(user_ids), 'created_at': now,
+             'published_at': now - timedelta(seconds=rng.randrange(30 * 24 * 3600))}
+            for i in range(start, min(start + CHUNK, args.posts))
+        ])
+
+    db.session.execute(insert(TimelineEntry).from_select(
+        ['user_id', 'post_id', 'published_at'],
+        select(Follow.follower_id, Post.id, Post.published_at)
+        .join(Follow, Follow.followee_id == Post.user_id)
+        .join(UserStats, UserStats.user_id == Post.user_id)
+        .where(UserStats.follower_count < threshold)
+    ))
+    db.session.commit()
+    return user_ids, followers
+
+
+def publish(db, Post, app, publish_post, author_id, threshold, keep):
+    """Publish one post; returns (timeline rows written, seconds)"""
+    app.config['FEED_FANOUT_THRESHOLD'] = threshold
+    post = Post(title='New post', slug=f'new-{uuid.uuid4()}', content='x', excerpt='x',
+                is_published=True, published_at=datetime.utcnow(), user_id=author_id)
+    savepoint = None if keep else db.session.begin_nested()
+    start = time.perf_counter()
+    db.session.add(post)
+    rows = publish_post(post)
+    elapsed = time.perf_counter() - start
+    if savepoint is not None:
+        savepoint.rollback()
+    else:
+        db.session.commit()
+    return rows, elapsed
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--follows', type=int, default=20, help='authors followed per user')
+    parser.add_argument('--posts', type=int, default=50000, help='posts seeded before measuring')
+    parser.add_argument('--publish', type=int, default=100, help='posts published per author group')
+    parser.add_argument('--readers', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    from app import create_app
+    from database import db, User, Post, Follow, TimelineEntry, UserStats
+    from utils.timeline import feed_page, publish_post
+
+    rng = random.Random(args.seed)
+    app = create_app()
+    threshold = app.config['FEED_FANOUT_THRESHOLD']
+
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        user_ids, followers = seed(db, (User, Post, Follow, TimelineEntry, UserStats),
+                                   args, rng, threshold)
+        print(f'seeded {args.users} users, {sum(followers.values())} follows, {args.posts} posts, '
+              f'{TimelineEntry.query.count()} timeline rows in {time.perf_counter() - start:.1f}s')
+        high = sum(1 for count in followers.values() if count >= threshold)
+        print(f'{high} authors at or above the {threshold}-follower fan-out threshold '
+              f'(max {max(followers.values())} followers)\n')
+
+        by_popularity = sorted(range(args.users), key=lambda i: -followers[i])
+        groups = {
+            'random authors': rng.sample(range(args.users), args.publish),
+            'top 0.1% authors': [rng.choice(by_popularity[:max(1, args.users // 1000)])
+                                 for _ in range(args.publish)],
+        }
+
+        print(f'{"write":<18} {"followers":>10} {"push rows":>10} {"push p50":>9} '
+              f'{"hybrid rows":>12} {"hybrid p50":>11} {"hybrid max":>11}')
+        for label, authors in groups.items():
+            push = [publish(db, Post, app, publish_post, user_ids[a], float('inf'), keep=False)
+                    for a in authors]
+            hybrid = [publish(db, Post, app, publish_post, user_ids[a], threshold, keep=True)
+                      for a in authors]
+            print(f'{label:<18} {statistics.mean(followers[a] for a in authors):>10.0f} '
+                  f'{statistics.mean(r for r, _ in push):>10.0f} '
+                  f'{statistics.median(t for _, t in push) * 1000:>7.2f}ms '
+                  f'{statistics.mean(r for r, _ in hybrid):>12.0f} '
+                  f'{statistics.median(t for _, t in hybrid) * 1000:>9.2f}ms '
+                  f'{max(t for _, t in hybrid) * 1000:>9.2f}ms')
+
+        readers = [user_ids[i] for i in rng.sample(range(args.users), args.readers)]
+        print(f'\n{"read (page 1)":<18} {"p50":>9} {"p95":>9} {"p99":>9}')
+        for label, read_threshold in (('hybrid', threshold), ('fan-out on read', 0)):
+            app.config['FEED_FANOUT_THRESHOLD'] = read_threshold
+            samples = []
+            for reader in readers:
+                db.session.expunge_all()
+                start = time.perf_counter()
+                feed_page(reader)
+                samples.append(time.perf_counter() - start)
+            print(f'{label:<18} ' + ' '.join(f'{percentile(samples, q) * 1000:>7.2f}ms'
+                                             for q in (0.5, 0.95, 0.99)))
+
+
+if __name__ == '__main__':
+    main()
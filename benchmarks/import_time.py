@@ -0,0 +1,72 @@
+"""Import-time budget check for the web app.
+
+Runs ``python -X importtime -c "import app"`` in a fresh interpreter, prints
+the slowest imports and exits non-zero if the total exceeds the budget or a
+dependency that should load lazily (Pillow, bleach, NumPy) was imported.
+Modules the interpreter imports on its own (``-c pass``) are not counted.
+Flask and SQLAlchemy alone take most of the default budget.
+
+    python benchmarks/import_time.py [--budget-ms 700] [--top 15]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed by specific requests or batch jobs, never at worker startup
+LAZY_MODULES = ('PIL', 'bleach', 'html5lib', 'numpy')
+
+LINE_RE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def measure(code='import app'):
+    """Return [(cumulative_us, depth, name)] for every import made running ``code``"""
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            rows.append((int(cumulative), len(indent) // 2, name))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget-ms', type=float, default=700)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--runs', type=int, default=3, help='best of N runs')
+    args = parser.parse_args()
+
+    # Interpreter startup (encodings, site, ...) is not the app's to budget
+    startup = {name for _, depth, name in measure('pass') if depth == 0}
+
+    def app_total_us(rows):
+        return sum(us for us, depth, name in rows if depth == 0 and name not in startup)
+
+    rows = min((measure() for _ in range(args.runs)), key=app_total_us)
+    total_ms = app_total_us(rows) / 1000
+
+    print(f'{"cumulative":>12}  module')
+    for us, depth, name in sorted(rows, key=lambda r: -r[0])[:args.top]:
+        print(f'{us / 1000:>10.1f}ms  {"  " * depth}{name}')
+    print(f'\ntotal import time: {total_ms:.1f}ms (budget {args.budget_ms:.0f}ms)')
+
+    failures = []
+    eager = sorted({name.split('.')[0] for _, _, name in rows} & set(LAZY_MODULES))
+    if eager:
+        failures.append(f'imported eagerly: {", ".join(eager)}')
+    if total_ms > args.budget_ms:
+        failures.append(f'over budget by {total_ms - args.budget_ms:.1f}ms')
+
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
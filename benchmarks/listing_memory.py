@@ -0,0 +1,139 @@
+"""Per-request peak memory of the listing pages for a prolific author.
+
+Seeds one author with 10k posts (plus a follower and an admin), then
+requests each listing page under tracemalloc and reports the peak Python
+allocation during the request. For comparison it also measures loading the
+dashboard's posts the old way, all of them as full ``Post`` entities with
+their likes, against the one page of PostSummary rows it loads now.
+
+    python benchmarks/listing_memory.py [--posts 10000] [--content-kb 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+PASSWORD = 'benchmark'
+
+
+def seed(db, models, bcrypt, args):
+    User, Post, Like, UserStats = models
+    now = datetime.utcnow()
+    password_hash = bcrypt.generate_password_hash(PASSWORD).decode('utf-8')
+
+    author = User(username='author', email='author@example.com', password_hash=password_hash)
+    reader = User(username='reader', email='reader@example.com', password_hash=password_hash)
+    admin = User(username='admin', email='admin@example.com', password_hash=password_hash, role='admin')
+    db.session.add_all([author, reader, admin])
+    db.session.flush()
+
+    body = '<p>' + 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * (args.content_kb * 18) + '</p>'
+    post_ids = [str(uuid.uuid4()) for _ in range(args.posts)]
+    db.session.execute(Post.__table__.insert(), [
+        {'id': post_id, 'title': f'Benchmark post {i}', 'slug': f'benchmark-post-{i}', 'content': body,
+         'excerpt': 'A short excerpt for the listing page.', 'category': 'technology',
+         'tags': 'python,flask', 'is_published': True, 'views': i, 'trending_score': 0,
+         'user_id': author.id, 'created_at': now - timedelta(minutes=i),
+         'updated_at': now - timedelta(minutes=i), 'published_at': now - timedelta(minutes=i)}
+        for i, post_id in enumerate(post_ids)
+    ])
+    db.session.execute(Like.__table__.insert(), [
+        {'id': str(uuid.uuid4()), 'user_id': liker.id, 'post_id': post_id, 'created_at': now}
+        for post_id in post_ids[::10] for liker in (reader, admin)
+    ])
+    db.session.commit()
+
+    from utils.timeline import follow
+    follow(reader.id, author.id)
+    UserStats.for_user(author.id)
+    db.session.commit()
+    return author.id
+
+
+def login(client, email):
+    client.post('/login', data={'email': email, 'password': PASSWORD})
+    return client
+
+
+def measure(fn):
+    """(peak bytes, seconds) allocated while running ``fn``"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--content-kb', type=int, default=4, help='approximate size of each post body')
+    args = parser.parse_args()
+
+    from app import create_app
+    from database import db, User, Post, Like, UserStats
+    from extensions import bcrypt
+    from utils.view_models import PostSummary, post_summaries
+
+    app = create_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+    with app.app_context():
+        db.create_all()
+        author_id = seed(db, (User, Post, Like, UserStats), bcrypt, args)
+
+    clients = {
+        'author': login(app.test_client(), 'author@example.com'),
+        'reader': login(app.test_client(), 'reader@example.com'),
+        'admin': login(app.test_client(), 'admin@example.com'),
+    }
+    pages = [
+        ('reader', '/'),
+        ('author', '/dashboard'),
+        ('reader', '/feed'),
+        ('reader', '/search?q=Benchmark'),
+        ('reader', '/u/author'),
+        ('admin', '/admin'),
+        ('admin', '/admin/users'),
+    ]
+
+    print(f'{args.posts} posts of ~{args.content_kb}KB each\n')
+    print(f'{"request":<24} {"status":>6} {"peak":>10} {"time":>9}')
+    for user, url in pages:
+        response = None
+
+        def request():
+            nonlocal response
+            response = clients[user].get(url)
+
+        peak, elapsed = measure(request)
+        print(f'{url:<24} {response.status_code:>6} {peak / 2**20:>8.1f}MB {elapsed * 1000:>7.0f}ms')
+
+    def entities():
+        posts = Post.query.filter_by(user_id=author_id).order_by(Post.created_at.desc()).all()
+        return [(post.title, post.views, len(post.likes)) for post in posts]
+
+    def summaries():
+        query = post_summaries().filter(Post.user_id == author_id).order_by(Post.created_at.desc())\
+            .limit(app.config['DASHBOARD_POSTS_PER_PAGE'])
+        return [(post.title, post.views, post.like_count) for post in map(PostSummary.from_row, query)]
+
+    print(f'\n{"dashboard rows":<24} {"":>6} {"peak":>10} {"time":>9}')
+    for label, load in (('Post entities + likes', entities), ('PostSummary page', summaries)):
+        with app.app_context():
+            peak, elapsed = measure(load)
+        print(f'{label:<24} {"":>6} {peak / 2**20:>8.1f}MB {elapsed * 1000:>7.0f}ms')
+
+
+if __name__ == '__main__':
+    main()
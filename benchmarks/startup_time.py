@@ -0,0 +1,95 @@
+"""Measure application startup time.
+
+* cold start: a fresh interpreter importing ``app`` and calling create_app()
+* time to ready: launching ``python -m postpilot serve`` until /readyz
+  answers, with and without preloading the app before fork
+
+    python benchmarks/startup_time.py [--runs 5] [--workers 4]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_START = (
+    'import time; t = time.perf_counter(); '
+    'from app import create_app; create_app(); '
+    'print(time.perf_counter() - t)'
+)
+
+
+def cold_start(env):
+    out = subprocess.run([sys.executable, '-c', COLD_START], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def time_to_ready(env, workers, preload, timeout=60):
+    port = _free_port()
+    args = [sys.executable, '-m', 'postpilot', 'serve', '--bind', f'127.0.0.1:{port}',
+            '--workers', str(workers), '--pidfile', os.path.join(env['BENCH_DIR'], f'{port}.pid')]
+    if not preload:
+        args.append('--no-preload')
+
+    start = time.perf_counter()
+    server = subprocess.Popen(args, cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/readyz', timeout=1) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError('server did not become ready')
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    bench_dir = tempfile.mkdtemp()
+    env = dict(os.environ,
+               BENCH_DIR=bench_dir,
+               DATABASE_URL='sqlite:///' + os.path.join(bench_dir, 'bench.db'))
+    subprocess.run([sys.executable, '-m', 'postpilot', 'init'], cwd=ROOT, env=env,
+                   check=True, stdout=subprocess.DEVNULL)
+
+    def report(label, samples):
+        print(f'{label:<36} median {statistics.median(samples) * 1000:8.1f} ms'
+              f'   min {min(samples) * 1000:8.1f} ms')
+
+    report('cold start (import + create_app)', [cold_start(env) for _ in range(args.runs)])
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        print('gunicorn not installed; skipping time-to-ready')
+        return
+
+    for preload in (True, False):
+        label = f'ready, {args.workers} workers, ' + ('preload' if preload else 'no preload')
+        report(label, [time_to_ready(env, args.workers, preload) for _ in range(args.runs)])
+
+
+if __name__ == '__main__':
+    main()
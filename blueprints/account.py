@@ -0,0 +1,56 @@
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app
+from flask_login import login_required, current_user
+
+from database import db, Post, UserStats
+from extensions import bcrypt
+from forms import ProfileForm
+from utils.helpers import save_image
+from utils.view_models import PostSummary, post_summaries
+
+account = Blueprint('account', __name__)
+
+
+@account.route('/dashboard')
+@login_required
+def dashboard():
+    """User dashboard"""
+    page = request.args.get('page', 1, type=int)
+    user_posts = post_summaries().filter(Post.user_id == current_user.id)\
+        .order_by(Post.created_at.desc()).paginate(
+            page=page, per_page=current_app.config['DASHBOARD_POSTS_PER_PAGE'], error_out=False
+        )
+    user_posts.items = [PostSummary.from_row(row) for row in user_posts.items]
+    stats = UserStats.for_user(current_user.id)
+
+    return render_template('dashboard.html', posts=user_posts, stats=stats)
+
+
+@account.route('/profile', methods=['GET', 'POST'])
+@login_required
+def profile():
+    """User profile"""
+    form = ProfileForm(obj=current_user)
+
+    if form.validate_on_submit():
+        current_user.username = form.username.data
+        current_user.bio = form.bio.data
+
+        # Update profile image if new one uploaded
+        if form.profile_image.data:
+            current_user.profile_image = save_image(form.profile_image.data)
+
+        # Update password if provided
+        if form.password.data:
+            current_user.password_hash = bcrypt.generate_password_hash(
+                form.password.data
+            ).decode('utf-8')
+
+        db.session.commit()
+        flash('Profile updated successfully!', 'success')
+        return redirect(url_for('account.profile'))
+
+    stats = UserStats.for_user(current_user.id)
+    recent_posts = Post.query.filter_by(user_id=current_user.id)\
+        .order_by(Post.updated_at.desc()).limit(5).all()
+
+    return render_template('profile.html', form=form, stats=stats, recent_posts=recent_posts)
@@ -0,0 +1,242 @@
+from datetime import datetime
+
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, jsonify, abort
+from flask_login import login_required, current_user
+
+from database import db, User, Post, Comment
+from utils.view_models import PostSummary, UserSummary, post_summaries, user_summaries, stream
+
+admin = Blueprint('admin', __name__)
+
+
+@admin.route('/admin')
+@login_required
+def dashboard():
+    """Admin dashboard"""
+    if not current_user.is_admin():
+        abort(403)
+
+    stats = {
+        'total_users': User.query.count(),
+        'total_posts': Post.query.count(),
+        'total_comments': Comment.query.count(),
+        'pending_comments': Comment.query.filter_by(is_approved=False).count()
+    }
+
+    # Recent activity
+    recent_posts = [PostSummary.from_row(row) for row in
+                    post_summaries().order_by(Post.created_at.desc()).limit(10)]
+    recent_users = [UserSummary.from_row(row) for row in
+                    user_summaries().order_by(User.created_at.desc()).limit(10)]
+
+    return render_template('admin.html', 
+                         stats=stats,
+                         recent_posts=recent_posts,
+                         recent_users=recent_users,
+                         now=datetime.utcnow)
+
+
+def moderation_queue(status, page):
+    """Paginated comments for moderation, newest first"""
+    query = Comment.query.options(
+        db.joinedload(Comment.commenter),
+        db.joinedload(Comment.post).load_only(Post.title, Post.slug)
+    )
+    if status == 'pending':
+        # Served by the partial index on unapproved comments
+        query = query.filter(Comment.is_approved == False)
+
+    return query.order_by(Comment.created_at.desc()).paginate(
+        page=page, per_page=current_app.config['COMMENTS_PER_PAGE'], error_out=False
+    )
+
+
+def requested_comment_ids():
+    """Comment ids from a bulk action form or JSON body"""
+    if request.is_json:
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            abort(400)
+        comment_ids = body.get('ids', [])
+    else:
+        comment_ids = request.form.getlist('comment_ids')
+
+    if not isinstance(comment_ids, list) or len(comment_ids) > current_app.config['MODERATION_MAX_BATCH']:
+        abort(400)
+    return [str(comment_id) for comment_id in comment_ids]
+
+
+@admin.route('/admin/comments')
+@login_required
+def comments():
+    """Comment moderation queue (admin only)"""
+    if not current_user.is_admin():
+        abort(403)
+
+    status = request.args.get('status', 'pending')
+    page = request.args.get('page', 1, type=int)
+
+    comments = moderation_queue(status, page)
+    pending_count = comments.total if status == 'pending' \
+        else Comment.query.filter(Comment.is_approved == False).count()
+
+    return render_template('admin_comments.html',
+                         comments=comments,
+                         status=status,
+                         pending_count=pending_count)
+
+
+@admin.route('/admin/comments/approve', methods=['POST'])
+@login_required
+def bulk_approve_comments():
+    """Approve selected comments in one UPDATE (admin only)"""
+    if not current_user.is_admin():
+        abort(403)
+
+    comment_ids = requested_comment_ids()
+    count = Comment.approve_many(comment_ids) if comment_ids else 0
+
+    flash(f'{count} comment(s) approved!', 'success')
+    return redirect(request.referrer or url_for('admin.comments'))
+
+
+@admin.route('/admin/comments/delete', methods=['POST'])
+@login_required
+def bulk_delete_comments():
+    """Delete selected comments in one DELETE (admin only)"""
+    if not current_user.is_admin():
+        abort(403)
+
+    comment_ids = requested_comment_ids()
+    count = Comment.delete_many(comment_ids) if comment_ids else 0
+
+    flash(f'{count} comment(s) deleted!', 'success')
+    return redirect(request.referrer or url_for('admin.comments'))
+
+
+@admin.route('/admin/comment/<comment_id>/approve', methods=['POST'])
+@login_required
+def approve_comment(comment_id):
+    """Approve comment (admin only)"""
+    if not current_user.is_admin():
+        abort(403)
+
+    comment = Comment.query.get_or_404(comment_id)
+    comment.is_approved = True
+    db.session.commit()
+
+    flash('Comment approved!', 'success')
+    return redirect(request.referrer or url_for('admin.comments'))
+
+
+@admin.route('/admin/users')
+@login_required
+def users():
+    """Manage users (admin only)"""
+    if not current_user.is_admin():
+        abort(403)
+
+    users = stream(user_summaries().order_by(User.created_at.desc()), UserSummary)
+    return render_template('admin_users.html', users=users)
+
+
+@admin.route('/admin/user/<user_id>/toggle', methods=['POST'])
+@login_required
+def toggle_user_status(user_id):
+    """Toggle user active status (admin only)"""
+    if not current_user.is_admin():
+        abort(403)
+
+    user = User.query.get_or_404(user_id)
+    user.is_active = not user.is_active
+    db.session.commit()
+
+    status = "activated" if user.is_active else "deactivated"
+    flash(f'User {status} successfully!', 'success')
+    return redirect(request.referrer or url_for('admin.users'))
+
+
+# API endpoints for analytics
+@admin.route('/api/analytics')
+@login_required
+def analytics():
+    """Get analytics data"""
+    if not current_user.is_admin():
+        abort(403)
+
+    # Daily post counts for last 30 days
+    import datetime
+    thirty_days_ago = datetime.datetime.utcnow() - datetime.timedelta(days=30)
+
+    daily_posts = db.session.query(
+        db.func.date(Post.created_at).label('date'),
+        db.func.count(Post.id).label('count')
+    ).filter(
+        Post.created_at >= thirty_days_ago
+    ).group_by(
+        db.func.date(Post.created_at)
+    ).all()
+
+    # Top categories
+    top_categories = db.session.query(
+        Post.category,
+        db.func.count(Post.id).label('count')
+    ).filter(
+        Post.is_published == True
+    ).group_by(
+        Post.category
+    ).order_by(
+        db.desc('count')
+    ).limit(5).all()
+
+    return jsonify({
+        'daily_posts': [{'date': str(d[0]), 'count': d[1]} for d in daily_posts],
+        'top_categories': [{'category': c[0], 'count': c[1]} for c in top_categories]
+    })
+
+
+@admin.route('/api/admin/comments')
+@login_required
+def api_comments():
+    """Moderation queue page as JSON (admin only)"""
+    if not current_user.is_admin():
+        abort(403)
+
+    status = request.args.get('status', 'pending')
+    page = request.args.get('page', 1, type=int)
+    comments = moderation_queue(status, page)
+
+    return jsonify({
+        'comments': [comment.to_dict() for comment in comments.items],
+        'page': comments.page,
+        'pages': comments.pages,
+        'total': comments.total
+    })
+
+
+@admin.route('/api/admin/comments/approve', methods=['POST'])
+@login_required
+def api_approve_comments():
+    """Bulk approve comments from a JSON list of ids (admin only)"""
+    if not current_user.is_admin():
+        abort(403)
+
+    count = Comment.approve_many(requested_comment_ids())
+    return jsonify({
+        'approved': count,
+        'pending': Comment.query.filter(Comment.is_approved == False).count()
+    })
+
+
+@admin.route('/api/admin/comments/delete', methods=['POST'])
+@login_required
+def api_delete_comments():
+    """Bulk delete comments from a JSON list of ids (admin only)"""
+    if not current_user.is_admin():
+        abort(403)
+
+    count = Comment.delete_many(requested_comment_ids())
+    return jsonify({
+        'deleted': count,
+        'pending': Comment.query.filter(Comment.is_approved == False).count()
+    })
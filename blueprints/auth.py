@@ -0,0 +1,64 @@
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask_login import login_user, logout_user, login_required, current_user
+
+from database import db, User, UserStats
+from extensions import bcrypt
+from forms import LoginForm, RegistrationForm
+
+auth = Blueprint('auth', __name__)
+
+
+@auth.route('/login', methods=['GET', 'POST'])
+def login():
+    if current_user.is_authenticated:
+        return redirect(url_for('blog.index'))
+
+    form = LoginForm()
+    if form.validate_on_submit():
+        user = User.query.filter_by(email=form.email.data).first()
+
+        if user and bcrypt.check_password_hash(user.password_hash, form.password.data):
+            if user.is_active:
+                login_user(user, remember=form.remember.data)
+                next_page = request.args.get('next')
+                flash('Login successful!', 'success')
+                return redirect(next_page or url_for('account.dashboard'))
+            else:
+                flash('Account is disabled. Contact admin.', 'danger')
+        else:
+            flash('Login unsuccessful. Check email and password.', 'danger')
+
+    return render_template('login.html', form=form)
+
+
+@auth.route('/register', methods=['GET', 'POST'])
+def register():
+    if current_user.is_authenticated:
+        return redirect(url_for('blog.index'))
+
+    form = RegistrationForm()
+    if form.validate_on_submit():
+        hashed_password = bcrypt.generate_password_hash(form.password.data).decode('utf-8')
+
+        user = User(
+            username=form.username.data,
+            email=form.email.data,
+            password_hash=hashed_password
+        )
+        user.stats = UserStats()
+
+        db.session.add(user)
+        db.session.commit()
+
+        flash('Account created successfully! You can now log in.', 'success')
+        return redirect(url_for('auth.login'))
+
+    return render_template('register.html', form=form)
+
+
+@auth.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    flash('You have been logged out.', 'info')
+    return redirect(url_for('blog.index'))
@@ -0,0 +1,388 @@
+from datetime import datetime
+import uuid
+
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, jsonify, abort
+from flask_login import login_required, current_user
+
+from database import db, User, Post, Comment, Like, Follow, UserStats
+from forms import PostForm, CommentForm
+from utils.helpers import generate_slug, save_image, sanitize_html, parse_cursor
+from utils.sitemap import mark_post_stale
+from utils.timeline import feed_page, follow, unfollow, publish_post, retract_post
+from utils.view_models import PostSummary, post_summaries
+
+blog = Blueprint('blog', __name__)
+
+
+@blog.route('/')
+def index():
+    """Public blog feed"""
+    page = request.args.get('page', 1, type=int)
+    category = request.args.get('category')
+
+    # Base query for published posts
+    query = post_summaries().filter(Post.is_published == True)
+
+    # Filter by category
+    if category:
+        query = query.filter(Post.category == category)
+
+    # Order by publication date
+    posts = query.order_by(Post.published_at.desc()).paginate(
+        page=page, per_page=current_app.config['POSTS_PER_PAGE'], error_out=False
+    )
+    posts.items = [PostSummary.from_row(row) for row in posts.items]
+
+    # Get featured posts (highest time-decayed trending score)
+    featured_posts = [PostSummary.from_row(row) for row in
+                      Post.trending(limit=3, query=post_summaries())]
+
+    return render_template('index.html', posts=posts, featured_posts=featured_posts, category=category)
+
+
+@blog.route('/post/<slug>')
+def view_post(slug):
+    """Individual blog post"""
+    post = Post.query.filter_by(slug=slug, is_published=True).first_or_404()
+
+    # Increment view count
+    post.increment_views()
+
+    author_stats = UserStats.for_user(post.user_id)
+
+    # Get comments
+    comments = Comment.query.filter_by(
+        post_id=post.id, 
+        parent_id=None,
+        is_approved=True
+    ).order_by(Comment.created_at.desc()).all()
+
+    # Check if current user liked this post and follows its author
+    user_liked = False
+    following = False
+    if current_user.is_authenticated:
+        user_liked = Like.query.filter_by(
+            user_id=current_user.id, 
+            post_id=post.id
+        ).first() is not None
+        following = Follow.query.filter_by(
+            follower_id=current_user.id,
+            followee_id=post.user_id
+        ).first() is not None
+
+    # Get similar posts
+    similar_posts = Post.query.filter(
+        Post.category == post.category,
+        Post.id != post.id,
+        Post.is_published == True
+    ).order_by(Post.views.desc()).limit(3).all()
+
+    form = CommentForm()
+    return render_template('post.html', 
+                         post=post, 
+                         author_stats=author_stats,
+                         comments=comments, 
+                         form=form,
+                         user_liked=user_liked,
+                         following=following,
+                         similar_posts=similar_posts)
+
+
+@blog.route('/search')
+def search():
+    """Search blog posts"""
+    query = request.args.get('q', '')
+    page = request.args.get('page', 1, type=int)
+
+    if query:
+        posts = post_summaries(preview=True).filter(
+            Post.is_published == True,
+            (Post.title.ilike(f'%{query}%') | 
+             Post.content.ilike(f'%{query}%') |
+             Post.tags.ilike(f'%{query}%'))
+        ).order_by(Post.published_at.desc()).paginate(
+            page=page, per_page=current_app.config['POSTS_PER_PAGE'], error_out=False
+        )
+        posts.items = [PostSummary.from_row(row) for row in posts.items]
+    else:
+        posts = []
+
+    return render_template('search.html', posts=posts, query=query)
+
+
+@blog.route('/u/<username>')
+def author(username):
+    """Public author page"""
+    user = User.query.filter_by(username=username).first_or_404()
+    stats = UserStats.for_user(user.id)
+    per_page = current_app.config['POSTS_PER_PAGE']
+
+    # Keyset pagination: ?before=<published_at>,<id> of the last post seen
+    query = post_summaries().filter(Post.user_id == user.id, Post.is_published == True)
+    cursor = parse_cursor(request.args.get('before'))
+    if cursor:
+        published_at, post_id = cursor
+        query = query.filter(
+            (Post.published_at < published_at) |
+            ((Post.published_at == published_at) & (Post.id < post_id))
+        )
+
+    posts = [PostSummary.from_row(row) for row in
+             query.order_by(Post.published_at.desc(), Post.id.desc()).limit(per_page + 1)]
+    next_cursor = None
+    if len(posts) > per_page:
+        posts = posts[:per_page]
+        next_cursor = f'{posts[-1].published_at.isoformat()},{posts[-1].id}'
+
+    following = False
+    if current_user.is_authenticated:
+        following = Follow.query.filter_by(
+            follower_id=current_user.id,
+            followee_id=user.id
+        ).first() is not None
+
+    return render_template('author.html', 
+                         author=user, 
+                         stats=stats, 
+                         posts=posts, 
+                         next_cursor=next_cursor,
+                         following=following)
+
+
+@blog.route('/u/<username>/follow', methods=['POST'])
+@login_required
+def toggle_follow(username):
+    """Follow or unfollow an author"""
+    user = User.query.filter_by(username=username).first_or_404()
+
+    if user.id == current_user.id:
+        flash('You cannot follow yourself.', 'warning')
+        return redirect(request.referrer or url_for('blog.author', username=user.username))
+
+    existing_follow = Follow.query.filter_by(
+        follower_id=current_user.id,
+        followee_id=user.id
+    ).first()
+
+    if existing_follow:
+        unfollow(current_user.id, user.id)
+        flash(f'You unfollowed {user.username}.', 'info')
+    else:
+        follow(current_user.id, user.id)
+        flash(f'You are now following {user.username}.', 'success')
+
+    db.session.commit()
+    return redirect(request.referrer or url_for('blog.author', username=user.username))
+
+
+@blog.route('/feed')
+@login_required
+def feed():
+    """Home timeline of posts by followed authors"""
+    posts, next_cursor = feed_page(current_user.id, parse_cursor(request.args.get('before')))
+    if next_cursor:
+        next_cursor = f'{next_cursor[0].isoformat()},{next_cursor[1]}'
+
+    return render_template('feed.html', posts=posts, next_cursor=next_cursor)
+
+
+@blog.route('/post/new', methods=['GET', 'POST'])
+@login_required
+def create_post():
+    """Create new blog post"""
+    form = PostForm()
+
+    if form.validate_on_submit():
+        slug = generate_slug(form.title.data)
+
+        # Check if slug already exists
+        existing_post = Post.query.filter_by(slug=slug).first()
+        if existing_post:
+            slug = f"{slug}-{str(uuid.uuid4())[:8]}"
+
+        # Save cover image if uploaded
+        cover_image = None
+        if form.cover_image.data:
+            cover_image = save_image(form.cover_image.data)
+
+        post = Post(
+            title=form.title.data,
+            slug=slug,
+            content=sanitize_html(form.content.data),
+            excerpt=form.excerpt.data,
+            category=form.category.data,
+            tags=form.tags.data,
+            cover_image=cover_image,
+            is_published=form.is_published.data,
+            user_id=current_user.id
+        )
+
+        if form.is_published.data:
+            post.published_at = datetime.utcnow()
+
+        db.session.add(post)
+        mark_post_stale(post)
+        UserStats.bump(post.user_id, post_count=1, published_count=int(post.is_published))
+        if post.is_published:
+            publish_post(post)
+        db.session.commit()
+
+        flash('Post created successfully!', 'success')
+        return redirect(url_for('account.dashboard'))
+
+    return render_template('create_edit_post.html', form=form, title='Create New Post')
+
+
+@blog.route('/post/<slug>/edit', methods=['GET', 'POST'])
+@login_required
+def edit_post(slug):
+    """Edit existing blog post"""
+    post = Post.query.filter_by(slug=slug).first_or_404()
+
+    # Check ownership
+    if post.user_id != current_user.id and not current_user.is_admin():
+        abort(403)
+
+    form = PostForm(obj=post)
+
+    if form.validate_on_submit():
+        was_published = post.is_published
+
+        # Update post
+        post.title = form.title.data
+        post.content = sanitize_html(form.content.data)
+        post.excerpt = form.excerpt.data
+        post.category = form.category.data
+        post.tags = form.tags.data
+        post.is_published = form.is_published.data
+        post.updated_at = datetime.utcnow()
+
+        # Update slug if title changed
+        new_slug = generate_slug(form.title.data)
+        if new_slug != post.slug:
+            existing_post = Post.query.filter_by(slug=new_slug).first()
+            if not existing_post:
+                post.slug = new_slug
+
+        # Update cover image if new one uploaded
+        if form.cover_image.data:
+            post.cover_image = save_image(form.cover_image.data)
+
+        # Update publication date if just published
+        if form.is_published.data and not post.published_at:
+            post.published_at = datetime.utcnow()
+
+        mark_post_stale(post)
+        UserStats.bump(post.user_id, published_count=int(post.is_published) - int(was_published))
+        if post.is_published and not was_published:
+            publish_post(post)
+        elif was_published and not post.is_published:
+            retract_post(post)
+        db.session.commit()
+        flash('Post updated successfully!', 'success')
+        return redirect(url_for('blog.view_post', slug=post.slug))
+
+    return render_template('create_edit_post.html', form=form, post=post, title='Edit Post')
+
+
+@blog.route('/post/<slug>/delete', methods=['POST'])
+@login_required
+def delete_post(slug):
+    """Delete blog post"""
+    post = Post.query.filter_by(slug=slug).first_or_404()
+
+    # Check ownership or admin
+    if post.user_id != current_user.id and not current_user.is_admin():
+        abort(403)
+
+    mark_post_stale(post)
+    like_count = Like.query.filter_by(post_id=post.id).count()
+    retract_post(post)
+    db.session.delete(post)
+    db.session.flush()
+    UserStats.bump(post.user_id,
+                   post_count=-1,
+                   published_count=-int(post.is_published),
+                   total_views=-(post.views or 0),
+                   total_likes=-like_count)
+    db.session.commit()
+
+    flash('Post deleted successfully!', 'success')
+    return redirect(url_for('account.dashboard'))
+
+
+# Comment routes
+@blog.route('/post/<slug>/comment', methods=['POST'])
+@login_required
+def add_comment(slug):
+    """Add comment to post"""
+    post = Post.query.filter_by(slug=slug, is_published=True).first_or_404()
+
+    form = CommentForm()
+    if form.validate_on_submit():
+        comment = Comment(
+            content=form.content.data,
+            user_id=current_user.id,
+            post_id=post.id,
+            parent_id=form.parent_id.data if form.parent_id.data else None
+        )
+
+        # Auto-approve for admin, others need approval
+        if not current_user.is_admin():
+            comment.is_approved = False
+            flash('Your comment will be visible after approval.', 'info')
+        else:
+            flash('Comment added successfully!', 'success')
+
+        db.session.add(comment)
+        db.session.commit()
+
+    return redirect(url_for('blog.view_post', slug=slug) + '#comments')
+
+
+@blog.route('/comment/<comment_id>/delete', methods=['POST'])
+@login_required
+def delete_comment(comment_id):
+    """Delete comment"""
+    comment = Comment.query.get_or_404(comment_id)
+
+    # Check ownership or admin
+    if comment.user_id != current_user.id and not current_user.is_admin():
+        abort(403)
+
+    db.session.delete(comment)
+    db.session.commit()
+
+    flash('Comment deleted successfully!', 'success')
+    return redirect(url_for('blog.view_post', slug=comment.post.slug))
+
+
+# Like routes
+@blog.route('/post/<slug>/like', methods=['POST'])
+@login_required
+def toggle_like(slug):
+    """Toggle like on post"""
+    post = Post.query.filter_by(slug=slug, is_published=True).first_or_404()
+
+    existing_like = Like.query.filter_by(
+        user_id=current_user.id,
+        post_id=post.id
+    ).first()
+
+    if existing_like:
+        # Unlike
+        db.session.delete(existing_like)
+        liked = False
+    else:
+        # Like
+        like = Like(user_id=current_user.id, post_id=post.id)
+        db.session.add(like)
+        liked = True
+
+    UserStats.bump(post.user_id, total_likes=1 if liked else -1)
+    db.session.commit()
+
+    return jsonify({
+        'liked': liked,
+        'like_count': len(post.likes)
+    })
@@ -0,0 +1,21 @@
+from flask import Blueprint, jsonify
+
+from database import db
+
+health = Blueprint('health', __name__)
+
+
+@health.route('/healthz')
+def liveness():
+    """Liveness probe: the worker is up and answering requests"""
+    return jsonify({'status': 'ok'})
+
+
+@health.route('/readyz')
+def readiness():
+    """Readiness probe: the worker can reach the database"""
+    try:
+        db.session.execute(db.text('SELECT 1'))
+    except Exception:
+        return jsonify({'status': 'unavailable'}), 503
+    return jsonify({'status': 'ok'})
@@ -0,0 +1,32 @@
+import gzip
+
+from flask import Blueprint, current_app, request, send_file, abort
+
+from utils.sitemap import refresh_sitemaps, shard_path
+
+sitemap = Blueprint('sitemap', __name__)
+
+
+@sitemap.route('/sitemap.xml')
+def index():
+    """Sitemap index, served gzip-compressed from disk"""
+    path = refresh_sitemaps()
+
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = send_file(path, mimetype='application/xml')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
+
+    with gzip.open(path, 'rb') as f:
+        return current_app.response_class(f.read(), mimetype='application/xml')
+
+
+@sitemap.route('/sitemaps/sitemap-<int:shard_id>.xml.gz')
+def shard(shard_id):
+    """Single sitemap shard of up to SITEMAP_SHARD_SIZE post URLs"""
+    path = shard_path(shard_id)
+    if path is None:
+        abort(404)
+
+    return send_file(path, mimetype='application/gzip')
@@ -11,4 +11,33 @@ class Config:
     SESSION_TYPE = 'filesystem'
     
     # Pagination
-    POSTS_PER_PAGE = 10
\ No newline at end of file
+    POSTS_PER_PAGE = 10
+    COMMENTS_PER_PAGE = 50  # Moderation queue
+    DASHBOARD_POSTS_PER_PAGE = 50  # Rows in an author's own post table
+    MODERATION_MAX_BATCH = 1000  # Comment ids accepted per bulk action
+    
+    # Sitemaps
+    SITEMAP_FOLDER = 'instance/sitemaps'
+    SITEMAP_SHARD_SIZE = 50000  # Protocol limit of URLs per sitemap file
+    
+    # Static assets and compression
+    ASSETS_DIST_FOLDER = 'dist'  # Built by `flask build-assets`, under static/
+    ASSETS_MAX_AGE = 365 * 24 * 60 * 60  # Fingerprinted files never change
+    COMPRESS_MIN_SIZE = 1024  # Smaller HTML bodies are sent uncompressed
+    COMPRESS_LEVEL = 6
+    
+    # Trending ranking (see utils/ranking.py)
+    RANKING_HALF_LIFE_HOURS = 48
+    RANKING_WINDOW_HALF_LIVES = 8  # Older activity weighs < 0.4% and is ignored
+    RANKING_WEIGHTS = {'views': 1.0, 'likes': 5.0, 'comments': 10.0}
+    
+    # Home timeline (see utils/timeline.py)
+    FEED_FANOUT_THRESHOLD = 10000  # Authors with more followers are merged in at read time
+    FEED_BACKFILL = 50  # Recent posts copied into a timeline on follow
+    FEED_BACKFILL_BATCH = 1000  # Followers per transaction in `flask backfill-timelines`
+    
+    # Production server (`python -m postpilot serve`)
+    SERVER_BIND = os.environ.get('BIND') or '127.0.0.1:8000'
+    SERVER_WORKERS = int(os.environ.get('WEB_CONCURRENCY') or (os.cpu_count() or 1) * 2 + 1)
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS') or 1)
+    SERVER_PIDFILE = os.environ.get('SERVER_PIDFILE') or 'instance/postpilot.pid'
\ No newline at end of file
@@ -1,4 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 import uuid
 
@@ -23,6 +24,7 @@ class User(UserMixin, db.Model):
     posts = db.relationship('Post', backref='author', lazy=True, cascade='all, delete-orphan')
     comments = db.relationship('Comment', backref='commenter', lazy=True, cascade='all, delete-orphan')
     likes = db.relationship('Like', backref='user', lazy=True, cascade='all, delete-orphan')
+    stats = db.relationship('UserStats', uselist=False, lazy=True, cascade='all, delete-orphan')
     
     def is_admin(self):
         return self.role == 'admin'
@@ -45,7 +47,8 @@ class Post(db.Model):
     views = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    published_at = db.Column(db.DateTime)
+    published_at = db.Column(db.DateTime, index=True)
+    trending_score = db.Column(db.Float, default=0, nullable=False)  # Refreshed by `flask refresh-rankings`
     
     # Foreign keys
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -54,10 +57,30 @@ class Post(db.Model):
     comments = db.relationship('Comment', backref='post', lazy=True, cascade='all, delete-orphan')
     likes = db.relationship('Like', backref='post', lazy=True, cascade='all, delete-orphan')
     
+    # Featured/trending lookups read the top of ix_posts_trending; author
+    # pages page through ix_posts_author_published
+    __table_args__ = (
+        db.Index('ix_posts_trending', 'trending_score', 'published_at'),
+        db.Index('ix_posts_author_published', 'user_id', 'published_at', 'id'),
+    )
+    
     def increment_views(self):
         self.views += 1
+        UserStats.bump(self.user_id, total_views=1)
         db.session.commit()
     
+    @classmethod
+    def trending(cls, limit=3, query=None):
+        """Top published posts by time-decayed score, newest first on ties.
+        
+        ``query`` selects something other than full entities, e.g. a
+        post_summaries() query.
+        """
+        query = cls.query if query is None else query
+        return query.filter(cls.is_published == True).order_by(
+            cls.trending_score.desc(), cls.published_at.desc()
+        ).limit(limit).all()
+    
     def __repr__(self):
         return f'<Post {self.title}>'
 
@@ -78,6 +101,46 @@ class Comment(db.Model):
     # Relationships
     replies = db.relationship('Comment', backref=db.backref('parent', remote_side=[id]), lazy=True)
     
+    # Partial index: the moderation queue only ever scans unapproved comments
+    __table_args__ = (
+        db.Index('ix_comments_pending', created_at,
+                 sqlite_where=is_approved == False,
+                 postgresql_where=is_approved == False),
+        db.Index('ix_comments_post', post_id),
+    )
+    
+    @classmethod
+    def approve_many(cls, comment_ids):
+        """Approve comments in a single UPDATE, returns the number approved"""
+        count = cls.query.filter(
+            cls.id.in_(comment_ids),
+            cls.is_approved == False
+        ).update({cls.is_approved: True, cls.updated_at: datetime.utcnow()},
+                 synchronize_session=False)
+        db.session.commit()
+        return count
+    
+    @classmethod
+    def delete_many(cls, comment_ids):
+        """Delete comments in a single DELETE, returns the number deleted"""
+        # Detach replies first, as the ORM does when deleting one comment
+        cls.query.filter(cls.parent_id.in_(comment_ids))\
+            .update({cls.parent_id: None}, synchronize_session=False)
+        count = cls.query.filter(cls.id.in_(comment_ids))\
+            .delete(synchronize_session=False)
+        db.session.commit()
+        return count
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'content': self.content,
+            'is_approved': self.is_approved,
+            'created_at': self.created_at.isoformat(),
+            'author': self.commenter.username,
+            'post': {'title': self.post.title, 'slug': self.post.slug},
+        }
+    
     def __repr__(self):
         return f'<Comment {self.id}>'
 
@@ -91,12 +154,50 @@ class Like(db.Model):
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
     post_id = db.Column(db.String(36), db.ForeignKey('posts.id'), nullable=False)
     
-    # Unique constraint
-    __table_args__ = (db.UniqueConstraint('user_id', 'post_id', name='unique_like'),)
+    # Unique constraint; listings count likes per post through ix_likes_post
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'post_id', name='unique_like'),
+        db.Index('ix_likes_post', 'post_id'),
+    )
     
     def __repr__(self):
         return f'<Like {self.id}>'
 
+class Follow(db.Model):
+    __tablename__ = 'follows'
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Foreign keys
+    follower_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    followee_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    
+    # One follow per pair; fan-out walks an author's followers by followee_id
+    __table_args__ = (
+        db.UniqueConstraint('follower_id', 'followee_id', name='unique_follow'),
+        db.Index('ix_follows_followee', 'followee_id', 'follower_id'),
+    )
+    
+    def __repr__(self):
+        return f'<Follow {self.follower_id} -> {self.followee_id}>'
+
+class TimelineEntry(db.Model):
+    __tablename__ = 'timeline_entries'
+    
+    # A post pushed into a follower's home timeline (see utils/timeline.py)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), primary_key=True)
+    post_id = db.Column(db.String(36), db.ForeignKey('posts.id'), primary_key=True)
+    published_at = db.Column(db.DateTime, nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_timeline_user_published', 'user_id', 'published_at', 'post_id'),
+        db.Index('ix_timeline_post', 'post_id'),
+    )
+    
+    def __repr__(self):
+        return f'<TimelineEntry {self.user_id} {self.post_id}>'
+
 class Category(db.Model):
     __tablename__ = 'categories'
     
@@ -106,4 +207,125 @@ class Category(db.Model):
     description = db.Column(db.String(200))
     
     def __repr__(self):
-        return f'<Category {self.name}>'
\ No newline at end of file
+        return f'<Category {self.name}>'
+
+class SitemapShard(db.Model):
+    __tablename__ = 'sitemap_shards'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    start_at = db.Column(db.DateTime, unique=True, nullable=False)  # Covers posts published from here to the next shard
+    url_count = db.Column(db.Integer, default=0)
+    lastmod = db.Column(db.DateTime)
+    is_stale = db.Column(db.Boolean, default=True)
+    
+    def __repr__(self):
+        return f'<SitemapShard {self.id}>'
+
+class UserStats(db.Model):
+    __tablename__ = 'user_stats'
+    
+    # Per-author counters, kept current incrementally by the write paths
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), primary_key=True)
+    post_count = db.Column(db.Integer, default=0, nullable=False)
+    published_count = db.Column(db.Integer, default=0, nullable=False)
+    total_views = db.Column(db.Integer, default=0, nullable=False)
+    total_likes = db.Column(db.Integer, default=0, nullable=False)
+    follower_count = db.Column(db.Integer, default=0, nullable=False)
+    # Dropped below FEED_FANOUT_THRESHOLD; cleared by `flask backfill-timelines`
+    timeline_backfill_pending = db.Column(db.Boolean, default=False, nullable=False)
+    
+    @classmethod
+    def compute(cls, user_id):
+        """Counters aggregated from scratch; used to backfill missing rows"""
+        post_count, published_count, total_views = db.session.query(
+            db.func.count(Post.id),
+            db.func.coalesce(db.func.sum(db.case((Post.is_published == True, 1), else_=0)), 0),
+            db.func.coalesce(db.func.sum(Post.views), 0)
+        ).filter(Post.user_id == user_id).one()
+        total_likes = Like.query.join(Post).filter(Post.user_id == user_id).count()
+        follower_count = Follow.query.filter_by(followee_id=user_id).count()
+        
+        return dict(post_count=post_count, published_count=published_count,
+                    total_views=total_views, total_likes=total_likes,
+                    follower_count=follower_count)
+    
+    @classmethod
+    def _backfill(cls, user_id):
+        """Insert the user's row aggregated from current data.
+        
+        Returns False if a concurrent request inserted it first; the
+        savepoint keeps the rest of the transaction usable.
+        """
+        stats = cls(user_id=user_id, **cls.compute(user_id))
+        try:
+            with db.session.begin_nested():
+                db.session.add(stats)
+        except IntegrityError:
+            return False
+        return True
+    
+    @classmethod
+    def for_user(cls, user_id):
+        """The user's stats row, backfilled on first access"""
+        stats = cls.query.get(user_id)
+        if stats is None:
+            cls._backfill(user_id)
+            db.session.commit()
+            stats = cls.query.get(user_id)
+        return stats
+    
+    @classmethod
+    def bump(cls, user_id, **deltas):
+        """Apply counter deltas in one UPDATE without committing.
+        
+        Call after the change itself is flushed: a user without a stats row
+        gets one aggregated from the current data, which already includes it.
+        """
+        values = {getattr(cls, name): getattr(cls, name) + delta
+                  for name, delta in deltas.items() if delta}
+        if not values:
+            return
+        
+        query = cls.query.filter_by(user_id=user_id)
+        if not query.update(values, synchronize_session=False) and not cls._backfill(user_id):
+            # The winner aggregated without this change, so apply it on top
+            query.update(values, synchronize_session=False)
+    
+    def __repr__(self):
+        return f'<UserStats {self.user_id}>'
+
+def upgrade_schema():
+    """Create missing tables, columns and indexes; safe to run repeatedly.
+    
+    create_all() only creates tables that do not exist yet, so columns and
+    indexes added to a model later never reach an existing database. Returns
+    a description of each change made.
+    """
+    db.create_all()
+    inspector = db.inspect(db.engine)
+    changes = []
+    
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                
+                ddl = f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=conn.dialect)}'
+                default = column.default.arg if column.default is not None and column.default.is_scalar else None
+                if default is not None:
+                    ddl += ' DEFAULT ' + str(db.literal(default).compile(
+                        dialect=conn.dialect, compile_kwargs={'literal_binds': True}))
+                    if not column.nullable:
+                        ddl += ' NOT NULL'
+                conn.execute(db.text(ddl))
+                changes.append(f'added column {table.name}.{column.name}')
+            
+            existing = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(conn)
+                    changes.append(f'created index {index.name}')
+    
+    return changes
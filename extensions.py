@@ -0,0 +1,8 @@
+from flask_bcrypt import Bcrypt
+from flask_login import LoginManager
+from flask_wtf.csrf import CSRFProtect
+
+# Initialize extensions
+bcrypt = Bcrypt()
+login_manager = LoginManager()
+csrf = CSRFProtect()
@@ -0,0 +1,197 @@
+"""PostPilot command line.
+
+    python -m postpilot init      # create or upgrade the schema and the admin account
+    python -m postpilot serve     # multi-process production server
+    python -m postpilot reload    # zero-downtime reload of a running server
+
+`serve` uses gunicorn when it is installed: the app is preloaded in the
+master before forking so workers share its memory copy-on-write. Without
+gunicorn (e.g. on Windows) it falls back to a single-process threaded server.
+"""
+import argparse
+import gc
+import os
+import signal
+import sys
+import time
+
+from config import Config
+
+
+def init_command(args):
+    """Create or upgrade the schema and create the admin account"""
+    from app import create_app
+    from extensions import bcrypt
+    from database import db, User, upgrade_schema
+
+    app = create_app()
+    with app.app_context():
+        for change in upgrade_schema():
+            print(change.capitalize())
+
+        admin = User.query.filter_by(email=args.admin_email).first()
+        if admin:
+            print(f'Admin account {args.admin_email} already exists')
+            return
+
+        hashed_password = bcrypt.generate_password_hash(args.admin_password).decode('utf-8')
+        admin = User(
+            username='admin',
+            email=args.admin_email,
+            password_hash=hashed_password,
+            role='admin',
+            bio='System Administrator'
+        )
+        db.session.add(admin)
+        db.session.commit()
+        print(f'Created admin account {args.admin_email}')
+
+
+def _post_fork(server, worker):
+    """Drop database connections inherited from the preloaded master"""
+    flask_app = server.app.callable
+    if flask_app is None:
+        return
+
+    from database import db
+    with flask_app.app_context():
+        db.engine.dispose(close=False)
+
+
+def serve_command(args):
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        BaseApplication = None
+
+    if BaseApplication is None:
+        from werkzeug.serving import run_simple
+        from app import create_app
+
+        print('gunicorn is not installed; running a single-process threaded server',
+              file=sys.stderr)
+        host, port = args.bind.rsplit(':', 1)
+        run_simple(host, int(port), create_app(), threaded=True)
+        return
+
+    class PostPilotServer(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app import create_app
+
+            app = create_app()
+            if self.cfg.preload_app:
+                # Everything loaded so far is shared with the workers; keep the
+                # cyclic GC from writing to (and so copying) those pages after fork
+                gc.collect()
+                gc.freeze()
+            return app
+
+    PostPilotServer({
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'preload_app': args.preload,
+        'pidfile': args.pidfile,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'accesslog': '-',
+        'post_fork': _post_fork,
+    }).run()
+
+
+def _read_pid(pidfile):
+    try:
+        with open(pidfile) as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def reload_command(args):
+    """Start a new master on the new code, then retire the old one.
+
+    The new master inherits the listening socket, so no connection is
+    refused; the old master stops accepting and finishes in-flight requests
+    within its graceful timeout. If the new master does not come up the old
+    one is left serving.
+    """
+    old_pid = _read_pid(args.pidfile)
+    if not old_pid or not _is_running(old_pid):
+        sys.exit(f'No running server found in {args.pidfile}')
+
+    os.kill(old_pid, signal.SIGUSR2)
+
+    # The new master writes "<pidfile>.2" and takes over the pidfile once
+    # the old master has exited
+    deadline = time.monotonic() + args.wait
+    new_pid = None
+    while time.monotonic() < deadline:
+        new_pid = _read_pid(args.pidfile + '.2')
+        if new_pid:
+            break
+        time.sleep(0.2)
+
+    if new_pid is not None:
+        # gunicorn halts the new master if its workers fail to boot
+        time.sleep(args.settle)
+    if new_pid is None or not _is_running(new_pid):
+        sys.exit('New server failed to start; old server left running')
+
+    os.kill(old_pid, signal.SIGTERM)
+    print(f'Reloaded: {old_pid} -> {new_pid}')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m postpilot')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    init = commands.add_parser('init', help='create or upgrade the schema and the admin account')
+    init.add_argument('--admin-email', default=os.environ.get('ADMIN_EMAIL', 'admin@blog.com'))
+    init.add_argument('--admin-password', default=os.environ.get('ADMIN_PASSWORD', 'admin123'))
+    init.set_defaults(func=init_command)
+
+    serve = commands.add_parser('serve', help='run the production server')
+    serve.add_argument('--bind', default=Config.SERVER_BIND)
+    serve.add_argument('--workers', type=int, default=Config.SERVER_WORKERS)
+    serve.add_argument('--threads', type=int, default=Config.SERVER_THREADS)
+    serve.add_argument('--no-preload', dest='preload', action='store_false',
+                       help='import the app in each worker instead of once before fork')
+    serve.add_argument('--pidfile', default=Config.SERVER_PIDFILE)
+    serve.add_argument('--timeout', type=int, default=30)
+    serve.add_argument('--graceful-timeout', type=int, default=30)
+    serve.set_defaults(func=serve_command)
+
+    reload = commands.add_parser('reload', help='zero-downtime reload of a running server')
+    reload.add_argument('--pidfile', default=Config.SERVER_PIDFILE)
+    reload.add_argument('--wait', type=float, default=30,
+                        help='seconds to wait for the new master to start')
+    reload.add_argument('--settle', type=float, default=3,
+                        help='seconds the new master must stay up before the old one stops')
+    reload.set_defaults(func=reload_command)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+// Comment moderation queue: bulk actions through the JSON API without page reloads
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('moderation-form');
+    if (!form) return;
+
+    const selectAll = document.getElementById('select-all');
+    const badge = document.getElementById('pending-badge');
+    const csrfToken = document.querySelector('meta[name="csrf-token"]').content;
+    const showingPending = new URLSearchParams(window.location.search).get('status') !== 'all';
+
+    function selectedIds() {
+        return Array.from(form.querySelectorAll('input[name="comment_ids"]:checked'))
+            .map(checkbox => checkbox.value);
+    }
+
+    selectAll?.addEventListener('change', function() {
+        form.querySelectorAll('input[name="comment_ids"]').forEach(checkbox => {
+            checkbox.checked = this.checked;
+        });
+    });
+
+    form.querySelectorAll('[data-bulk-action]').forEach(button => {
+        button.addEventListener('click', async function(e) {
+            const ids = selectedIds();
+            const action = this.dataset.bulkAction;
+            e.preventDefault();
+
+            if (ids.length === 0) return;
+            if (action === 'delete' && !confirm(`Delete ${ids.length} comment(s)?`)) return;
+
+            try {
+                const response = await fetch(form.dataset[action === 'approve' ? 'apiApprove' : 'apiDelete'], {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': csrfToken
+                    },
+                    body: JSON.stringify({ ids: ids })
+                });
+
+                if (!response.ok) {
+                    // Fall back to the regular form post
+                    form.action = this.getAttribute('formaction');
+                    form.submit();
+                    return;
+                }
+
+                const data = await response.json();
+                ids.forEach(id => {
+                    const row = document.getElementById(`comment-row-${id}`);
+                    if (!row) return;
+                    if (action === 'delete' || showingPending) {
+                        row.remove();
+                    } else {
+                        row.querySelector('.user-status').className = 'user-status active';
+                        row.querySelector('.user-status').textContent = 'Approved';
+                        row.querySelector('input[name="comment_ids"]').checked = false;
+                    }
+                });
+
+                if (badge) {
+                    badge.textContent = data.pending;
+                    badge.style.display = data.pending > 0 ? '' : 'none';
+                }
+                if (selectAll) selectAll.checked = false;
+            } catch (error) {
+                console.error('Moderation action failed:', error);
+            }
+        });
+    });
+});
@@ -0,0 +1,115 @@
+// Store recent searches in localStorage
+document.addEventListener('DOMContentLoaded', function() {
+    const searchInput = document.querySelector('input[name="q"]');
+    const recentSearches = document.getElementById('recentTags');
+    const searchUrl = document.querySelector('.search-form').getAttribute('action');
+    
+    // Load recent searches from localStorage
+    function loadRecentSearches() {
+        const searches = JSON.parse(localStorage.getItem('recentSearches') || '[]');
+        if (searches.length > 0) {
+            recentSearches.innerHTML = searches.map(search => 
+                `<a href="${searchUrl}?q=${encodeURIComponent(search)}" class="tag recent">${search}</a>`
+            ).join('');
+            document.getElementById('recentSearches').style.display = 'block';
+        }
+    }
+    
+    // Save search to localStorage
+    if (searchInput && searchInput.value.trim()) {
+        const currentSearch = searchInput.value.trim();
+        let searches = JSON.parse(localStorage.getItem('recentSearches') || '[]');
+        
+        // Remove if already exists
+        searches = searches.filter(s => s !== currentSearch);
+        
+        // Add to beginning and keep only last 5
+        searches.unshift(currentSearch);
+        searches = searches.slice(0, 5);
+        
+        localStorage.setItem('recentSearches', JSON.stringify(searches));
+    }
+    
+    // Load on page load
+    loadRecentSearches();
+    
+    // Auto-focus search input
+    if (searchInput && !searchInput.value) {
+        searchInput.focus();
+    }
+    
+    // Clear search button
+    const clearBtn = document.createElement('button');
+    clearBtn.type = 'button';
+    clearBtn.className = 'clear-search';
+    clearBtn.innerHTML = '<i class="fas fa-times"></i>';
+    clearBtn.title = 'Clear search';
+    
+    clearBtn.addEventListener('click', function() {
+        searchInput.value = '';
+        searchInput.focus();
+        this.style.display = 'none';
+    });
+    
+    if (searchInput) {
+        searchInput.parentNode.appendChild(clearBtn);
+        
+        searchInput.addEventListener('input', function() {
+            clearBtn.style.display = this.value ? 'block' : 'none';
+        });
+        
+        // Show/hide clear button based on initial value
+        clearBtn.style.display = searchInput.value ? 'block' : 'none';
+    }
+    
+    // Keyboard shortcuts
+    document.addEventListener('keydown', function(e) {
+        if (e.key === '/' && e.target.tagName !== 'INPUT' && e.target.tagName !== 'TEXTAREA') {
+            e.preventDefault();
+            if (searchInput) {
+                searchInput.focus();
+            }
+        }
+        
+        if (e.key === 'Escape' && document.activeElement === searchInput) {
+            searchInput.blur();
+        }
+    });
+    
+    // Auto-search debounce
+    let searchTimeout;
+    if (searchInput) {
+        searchInput.addEventListener('input', function() {
+            clearTimeout(searchTimeout);
+            searchTimeout = setTimeout(() => {
+                if (this.value.trim().length >= 2) {
+                    this.form.submit();
+                }
+            }, 500);
+        });
+    }
+});
+
+// Function to update URL without page reload (for filters)
+function updateSearchParam(param, value) {
+    const url = new URL(window.location);
+    if (value) {
+        url.searchParams.set(param, value);
+    } else {
+        url.searchParams.delete(param);
+    }
+    window.history.replaceState({}, '', url);
+}
+
+// Function for search with filters
+function searchWithFilters() {
+    const searchInput = document.querySelector('input[name="q"]');
+    const categorySelect = document.querySelector('select[name="category"]');
+    
+    const params = new URLSearchParams();
+    if (searchInput.value) params.append('q', searchInput.value);
+    if (categorySelect.value) params.append('category', categorySelect.value);
+    
+    const searchUrl = document.querySelector('.search-form').getAttribute('action');
+    window.location.href = `${searchUrl}?${params.toString()}`;
+}
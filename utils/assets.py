@@ -0,0 +1,249 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+from flask import request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+MANIFEST_FILENAME = 'manifest.json'
+ASSET_EXTENSIONS = ('.css', '.js')
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON_RE = re.compile(r':\s+')  # Only after the colon: `a :hover` is a descendant selector
+
+# Characters after which a '/' starts a regex literal rather than a division
+_JS_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^') | {''}
+
+
+def minify_css(source):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = _CSS_COMMENT_RE.sub('', source)
+    css = _CSS_SPACE_RE.sub(' ', css)
+    css = _CSS_PUNCT_RE.sub(r'\1', css)
+    css = _CSS_COLON_RE.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_js(source):
+    """Conservatively minify a script.
+
+    Comments, indentation and blank lines are removed while strings,
+    template literals and regex literals are copied verbatim. Newlines are
+    kept so automatic semicolon insertion behaves exactly as before.
+    """
+    out = []
+    i, n = 0, len(source)
+    last = ''  # Last significant character emitted outside a literal
+
+    while i < n:
+        ch = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+
+        if ch == '/' and nxt == '/':
+            i = source.find('\n', i)
+            i = n if i == -1 else i
+        elif ch == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+        elif ch in '\'"`' or (ch == '/' and last in _JS_REGEX_PRECEDERS):
+            start = i
+            i += 1
+            in_class = False
+            while i < n:
+                c = source[i]
+                if c == '\\':
+                    i += 2
+                    continue
+                i += 1
+                if ch == '/' and c == '[':
+                    in_class = True
+                elif ch == '/' and c == ']':
+                    in_class = False
+                elif c == ch and not in_class:
+                    break
+            out.append(source[start:i])
+            last = ch
+        elif ch == '\n':
+            while out and out[-1] in (' ', '\t'):
+                out.pop()
+            if out and out[-1] != '\n':
+                out.append('\n')
+            i += 1
+            while i < n and source[i] in ' \t':
+                i += 1
+        elif ch in ' \t':
+            if out and out[-1] not in (' ', '\n'):
+                out.append(' ')
+            i += 1
+        else:
+            out.append(ch)
+            if ch.isalnum() or ch in '_$':
+                # Identifiers and keywords; `return /re/` is the common exception
+                word_end = i + 1
+                while word_end < n and (source[word_end].isalnum() or source[word_end] in '_$'):
+                    word_end += 1
+                word = source[i:word_end]
+                out.append(source[i + 1:word_end])
+                last = '' if word in ('return', 'typeof', 'case') else 'a'
+                i = word_end
+            else:
+                last = ch
+                i += 1
+
+    return ''.join(out).strip() + '\n'
+
+
+def _fingerprint(relpath, content):
+    digest = hashlib.md5(content).hexdigest()[:12]
+    root, ext = os.path.splitext(relpath)
+    return f'{root}.{digest}{ext}'
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def build_assets(static_folder, dist_folder):
+    """Minify, fingerprint and precompress every stylesheet and script.
+
+    Writes ``<name>.<hash>.<ext>`` plus ``.gz`` (and ``.br`` when brotli is
+    installed) variants into ``dist_folder`` along with a manifest mapping
+    source paths to fingerprinted ones. Returns a list of
+    ``(source, built, raw_bytes, min_bytes, gz_bytes, br_bytes)`` rows.
+    """
+    manifest = {}
+    report = []
+
+    for subdir in ('css', 'js'):
+        source_dir = os.path.join(static_folder, subdir)
+        if not os.path.isdir(source_dir):
+            continue
+        for name in sorted(os.listdir(source_dir)):
+            if not name.endswith(ASSET_EXTENSIONS):
+                continue
+            relpath = f'{subdir}/{name}'
+            with open(os.path.join(source_dir, name), encoding='utf-8') as f:
+                source = f.read()
+
+            minified = minify_css(source) if name.endswith('.css') else minify_js(source)
+            content = minified.encode('utf-8')
+            built = _fingerprint(relpath, content)
+            path = os.path.join(dist_folder, built)
+
+            gz = gzip.compress(content, compresslevel=9, mtime=0)
+            _write(path, content)
+            _write(path + '.gz', gz)
+            br = None
+            if brotli is not None:
+                br = brotli.compress(content, quality=11)
+                _write(path + '.br', br)
+
+            manifest[relpath] = built
+            report.append((relpath, built, len(source.encode('utf-8')), len(content),
+                           len(gz), len(br) if br is not None else None))
+
+    _write(os.path.join(dist_folder, MANIFEST_FILENAME),
+           json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return report
+
+
+def load_manifest(dist_folder):
+    path = os.path.join(dist_folder, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _accepts(encoding):
+    return request.accept_encodings[encoding] > 0
+
+
+def compress_body(data, level=6):
+    """Compress with the best encoding the client accepts, or return None"""
+    if brotli is not None and _accepts('br'):
+        return 'br', brotli.compress(data, quality=level)
+    if _accepts('gzip'):
+        return 'gzip', gzip.compress(data, compresslevel=level)
+    return None
+
+
+def init_assets(app):
+    """Wire the asset pipeline into ``app``.
+
+    Templates keep calling ``url_for('static', filename=...)``; sources
+    listed in the build manifest resolve to their fingerprinted copy under
+    ``/static/<ASSETS_DIST_FOLDER>/``, which is served precompressed with
+    immutable caching. Dynamic HTML above COMPRESS_MIN_SIZE is compressed
+    on the fly.
+    """
+    dist_name = app.config['ASSETS_DIST_FOLDER']
+    dist_folder = os.path.join(app.static_folder, dist_name)
+    manifest = load_manifest(dist_folder)
+
+    def asset_url_for(endpoint, **values):
+        if endpoint == 'static' and values.get('filename') in manifest:
+            values['filename'] = f"{dist_name}/{manifest[values['filename']]}"
+        return url_for(endpoint, **values)
+
+    app.jinja_env.globals['url_for'] = asset_url_for
+
+    @app.route(f'/static/{dist_name}/<path:filename>')
+    def asset(filename):
+        """Fingerprinted asset, preferring a precompressed variant"""
+        options = dict(mimetype=mimetypes.guess_type(filename)[0],
+                       max_age=app.config['ASSETS_MAX_AGE'])
+        response = None
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if _accepts(encoding) and os.path.isfile(os.path.join(dist_folder, filename + suffix)):
+                response = send_from_directory(dist_folder, filename + suffix, **options)
+                response.headers['Content-Encoding'] = encoding
+                break
+        if response is None:
+            response = send_from_directory(dist_folder, filename, **options)
+
+        response.vary.add('Accept-Encoding')
+        response.cache_control.immutable = True
+        return response
+
+    @app.after_request
+    def compress_html(response):
+        if (response.status_code != 200
+                or response.mimetype != 'text/html'
+                or response.direct_passthrough
+                or response.is_streamed
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        data = response.get_data()
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+
+        compressed = compress_body(data, app.config['COMPRESS_LEVEL'])
+        response.vary.add('Accept-Encoding')
+        if compressed is not None:
+            encoding, body = compressed
+            response.set_data(body)
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+    @app.cli.command('build-assets')
+    def build_assets_command():
+        """Minify, fingerprint and precompress static CSS/JS."""
+        report = build_assets(app.static_folder, dist_folder)
+        for source, built, raw, minified, gz, br in report:
+            br_text = f'{br:>7}' if br is not None else '      -'
+            print(f'{source:<22} {raw:>7} -> min {minified:>7}  gz {gz:>7}  br {br_text}  {built}')
+        manifest.clear()
+        manifest.update(load_manifest(dist_folder))
@@ -0,0 +1,86 @@
+import os
+import re
+import uuid
+from datetime import datetime
+
+from flask import current_app
+
+# Compiled once at import instead of on every call
+_SLUG_INVALID_RE = re.compile(r'[^a-z0-9\s-]')
+_SLUG_SEPARATOR_RE = re.compile(r'[\s-]+')
+
+ALLOWED_TAGS = ['p', 'br', 'b', 'i', 'u', 'em', 'strong', 'h1', 'h2', 'h3',
+                'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'a', 'blockquote', 'code', 'pre']
+ALLOWED_ATTRIBUTES = {'a': ['href', 'title', 'target']}
+
+
+def generate_slug(title):
+    """Generate URL-friendly slug from title"""
+    slug = title.lower()
+    slug = _SLUG_INVALID_RE.sub('', slug)
+    slug = _SLUG_SEPARATOR_RE.sub('-', slug)
+    slug = slug.strip('-')
+    return slug
+
+
+def save_image(image_file):
+    """Save and resize uploaded image"""
+    if not image_file:
+        return None
+
+    # Pillow is only needed on upload, keep it out of worker startup
+    from PIL import Image
+
+    filename = str(uuid.uuid4()) + '.jpg'
+    filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+
+    # Create upload folder if it doesn't exist
+    os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
+
+    # Open and process image
+    img = Image.open(image_file)
+
+    # Resize if too large
+    max_size = (1200, 800)
+    img.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+    # Convert to RGB if necessary
+    if img.mode in ('RGBA', 'P'):
+        img = img.convert('RGB')
+
+    # Save image
+    img.save(filepath, 'JPEG', quality=85)
+
+    return filename
+
+
+def sanitize_html(content):
+    """Sanitize HTML content to prevent XSS"""
+    # bleach (and html5lib under it) is only needed when saving a post
+    import bleach
+
+    return bleach.clean(content, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES)
+
+
+def parse_cursor(value):
+    """Parse a ``<published_at ISO>,<id>`` keyset cursor, None if malformed"""
+    if not value or ',' not in value:
+        return None
+    timestamp, post_id = value.split(',', 1)
+    try:
+        return datetime.fromisoformat(timestamp), post_id
+    except ValueError:
+        return None
+
+
+def time_ago(value):
+    """Describe a past UTC datetime relative to now, e.g. '3 hours ago'"""
+    if value is None:
+        return ''
+    seconds = int((datetime.utcnow() - value).total_seconds())
+    for unit, size in (('year', 365 * 86400), ('month', 30 * 86400), ('day', 86400),
+                       ('hour', 3600), ('minute', 60)):
+        if seconds >= size:
+            count = seconds // size
+            return f'{count} {unit}{"s" if count != 1 else ""} ago'
+    return 'just now'
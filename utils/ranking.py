@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from flask import current_app
+
+from database import db, Post, Like, Comment
+
+
+def decay(ages_hours, half_life_hours):
+    """Exponential decay weight for events ``ages_hours`` old"""
+    return np.exp2(-np.maximum(ages_hours, 0) / half_life_hours)
+
+
+def _ages_hours(timestamps, now):
+    """Vector of ages in hours from a sequence of datetimes"""
+    stamps = np.array(timestamps, dtype='datetime64[us]')
+    return (np.datetime64(now, 'us') - stamps) / np.timedelta64(1, 'h')
+
+
+def compute_scores(post_published, post_views, like_posts, like_created,
+                   comment_posts, comment_created, now, half_life_hours, weights):
+    """Time-decayed trending score for every post, fully vectorized.
+
+    ``post_published``/``post_views`` describe N posts. Likes and comments
+    arrive as parallel arrays of post indices (0..N-1) and timestamps, so
+    each event decays from the moment it happened. Views carry no
+    timestamps and decay with the age of the post instead.
+    """
+    n = len(post_views)
+    scores = weights['views'] * np.asarray(post_views, dtype=np.float64) \
+        * decay(_ages_hours(post_published, now), half_life_hours)
+
+    for kind, post_index, created in (('likes', like_posts, like_created),
+                                      ('comments', comment_posts, comment_created)):
+        if len(post_index):
+            event_weights = decay(_ages_hours(created, now), half_life_hours)
+            scores += weights[kind] * np.bincount(post_index, weights=event_weights, minlength=n)
+
+    return scores
+
+
+def _index_events(post_ids, events):
+    """Map (post_id, created_at) rows onto positions in ``post_ids``.
+
+    Events for posts outside ``post_ids`` (e.g. drafts) are dropped.
+    """
+    if not events:
+        return np.empty(0, dtype=np.intp), []
+    event_ids = np.array([post_id for post_id, _ in events])
+    order = np.argsort(post_ids)
+    positions = np.searchsorted(post_ids, event_ids, sorter=order)
+    positions = order[np.minimum(positions, len(post_ids) - 1)]
+    known = post_ids[positions] == event_ids
+    created = [created for (_, created), keep in zip(events, known) if keep]
+    return positions[known], created
+
+
+def refresh_scores(now=None):
+    """Batch job: recompute Post.trending_score for recently active posts.
+
+    Only posts published, liked or commented on within RANKING_WINDOW_HALF_LIVES
+    half-lives are scored; everything older has decayed to (almost) nothing and
+    is reset to zero. Returns the number of posts scored.
+    """
+    now = now or datetime.utcnow()
+    half_life = current_app.config['RANKING_HALF_LIFE_HOURS']
+    weights = current_app.config['RANKING_WEIGHTS']
+    since = now - timedelta(hours=half_life * current_app.config['RANKING_WINDOW_HALF_LIVES'])
+
+    recent_likes = db.session.query(Like.post_id, Like.created_at)\
+        .filter(Like.created_at >= since)
+    recent_comments = db.session.query(Comment.post_id, Comment.created_at)\
+        .filter(Comment.created_at >= since, Comment.is_approved == True)
+
+    posts = db.session.query(Post.id, Post.published_at, Post.views).filter(
+        Post.is_published == True,
+        Post.published_at.isnot(None),
+        (Post.published_at >= since)
+        | Post.id.in_(recent_likes.with_entities(Like.post_id))
+        | Post.id.in_(recent_comments.with_entities(Comment.post_id))
+    ).all()
+
+    # Scores are not edits: setting updated_at to itself stops its onupdate
+    # from firing, which would rewrite sitemap lastmod and activity ordering
+    Post.query.filter(Post.trending_score > 0)\
+        .update({Post.trending_score: 0, Post.updated_at: Post.updated_at},
+                synchronize_session=False)
+    if posts:
+        post_ids = np.array([post_id for post_id, _, _ in posts])
+        like_posts, like_created = _index_events(post_ids, recent_likes.all())
+        comment_posts, comment_created = _index_events(post_ids, recent_comments.all())
+
+        scores = compute_scores(
+            [published for _, published, _ in posts],
+            [views or 0 for _, _, views in posts],
+            like_posts, like_created,
+            comment_posts, comment_created,
+            now, half_life, weights
+        )
+        posts_table = Post.__table__
+        db.session.execute(
+            posts_table.update()
+            .where(posts_table.c.id == db.bindparam('post_id'))
+            .values(trending_score=db.bindparam('score'), updated_at=posts_table.c.updated_at),
+            [{'post_id': post_id, 'score': float(score)}
+             for post_id, score in zip(post_ids.tolist(), scores)]
+        )
+    db.session.commit()
+    return len(posts)
@@ -0,0 +1,195 @@
+import gzip
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from flask import current_app, url_for
+
+from database import db, Post, SitemapShard
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+INDEX_FILENAME = 'sitemap.xml.gz'
+
+
+def _sitemap_folder():
+    folder = os.path.join(current_app.root_path, current_app.config['SITEMAP_FOLDER'])
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def _format_lastmod(value):
+    return value.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+
+
+@contextmanager
+def _atomic_gzip(path):
+    """Write gzip text to a private temp file, then move it over ``path``.
+
+    Any worker may regenerate the same file concurrently; each writes its
+    own temp file so readers only ever see a complete one.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8') as f:
+            yield f
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def shard_filename(shard_id):
+    return f'sitemap-{shard_id}.xml.gz'
+
+
+def _shard_for(published_at):
+    """Return the shard whose published_at range contains the timestamp"""
+    shard = SitemapShard.query.filter(SitemapShard.start_at <= published_at)\
+        .order_by(SitemapShard.start_at.desc()).first()
+    if shard is None:
+        # Older than the first boundary: widen the first shard downwards
+        shard = SitemapShard.query.order_by(SitemapShard.start_at).first()
+        if shard is not None:
+            shard.start_at = published_at
+    return shard
+
+
+def _shard_posts(shard):
+    """Published posts inside the shard's [start_at, next.start_at) range"""
+    query = Post.query.filter(
+        Post.is_published == True,
+        Post.published_at >= shard.start_at
+    )
+    next_shard = SitemapShard.query.filter(SitemapShard.start_at > shard.start_at)\
+        .order_by(SitemapShard.start_at).first()
+    if next_shard is not None:
+        query = query.filter(Post.published_at < next_shard.start_at)
+    return query
+
+
+def mark_post_stale(post):
+    """Flag the shard holding ``post`` for regeneration.
+
+    Called from the write paths before the session is committed. New posts
+    always carry the newest ``published_at``, so only the last shard grows;
+    once it reaches SITEMAP_SHARD_SIZE a new shard is opened at the post.
+    Without any shards yet there is nothing to flag: the next
+    refresh_sitemaps() builds them all from the posts table.
+    """
+    if not post.published_at:
+        return
+
+    shard = _shard_for(post.published_at)
+    if shard is None:
+        return
+
+    is_last = SitemapShard.query.filter(
+        SitemapShard.start_at > shard.start_at
+    ).first() is None
+    limit = current_app.config['SITEMAP_SHARD_SIZE']
+    if is_last and post.published_at > shard.start_at \
+            and _shard_posts(shard).filter(Post.id != post.id).count() >= limit:
+        shard = SitemapShard(start_at=post.published_at)
+        db.session.add(shard)
+    shard.is_stale = True
+
+
+def rebuild_shards():
+    """Recompute every shard boundary from scratch, SITEMAP_SHARD_SIZE URLs each"""
+    SitemapShard.query.delete()
+    limit = current_app.config['SITEMAP_SHARD_SIZE']
+    rows = db.session.query(Post.published_at).filter(
+        Post.is_published == True,
+        Post.published_at.isnot(None)
+    ).order_by(Post.published_at)
+
+    previous = None
+    count = 0
+    for (published_at,) in rows.yield_per(1000):
+        # Posts sharing a timestamp never straddle a boundary
+        if previous is None or (count >= limit and published_at != previous):
+            db.session.add(SitemapShard(start_at=published_at))
+            count = 0
+        previous = published_at
+        count += 1
+    db.session.commit()
+
+
+def write_shard(shard):
+    """Render one shard to a gzip file on disk and clear its stale flag"""
+    path = os.path.join(_sitemap_folder(), shard_filename(shard.id))
+    rows = _shard_posts(shard).with_entities(Post.slug, Post.updated_at)\
+        .order_by(Post.published_at)
+
+    lastmod = None
+    url_count = 0
+    with _atomic_gzip(path) as f:
+        f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n')
+        for slug, updated_at in rows.yield_per(1000):
+            loc = escape(url_for('blog.view_post', slug=slug, _external=True))
+            f.write(f'<url><loc>{loc}</loc>')
+            if updated_at:
+                f.write(f'<lastmod>{_format_lastmod(updated_at)}</lastmod>')
+                lastmod = max(lastmod, updated_at) if lastmod else updated_at
+            f.write('</url>\n')
+            url_count += 1
+        f.write('</urlset>\n')
+
+    shard.url_count = url_count
+    shard.lastmod = lastmod or datetime.utcnow()
+    shard.is_stale = False
+
+
+def write_index(shards):
+    path = os.path.join(_sitemap_folder(), INDEX_FILENAME)
+    with _atomic_gzip(path) as f:
+        f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n')
+        for shard in shards:
+            loc = escape(url_for('sitemap.shard', shard_id=shard.id, _external=True))
+            f.write(f'<sitemap><loc>{loc}</loc>')
+            if shard.lastmod:
+                f.write(f'<lastmod>{_format_lastmod(shard.lastmod)}</lastmod>')
+            f.write('</sitemap>\n')
+        f.write('</sitemapindex>\n')
+
+
+def refresh_sitemaps():
+    """Regenerate stale shards and, if any changed, the sitemap index.
+
+    Returns the path of the gzip-compressed index file.
+    """
+    if SitemapShard.query.first() is None:
+        # Only rebuild once there is something to shard, rather than
+        # deleting and committing on every request to an empty blog
+        has_posts = db.session.query(Post.id).filter(
+            Post.is_published == True,
+            Post.published_at.isnot(None)
+        ).first() is not None
+        if has_posts:
+            rebuild_shards()
+
+    shards = SitemapShard.query.order_by(SitemapShard.start_at).all()
+    index_path = os.path.join(_sitemap_folder(), INDEX_FILENAME)
+    stale = [s for s in shards if s.is_stale
+             or not os.path.exists(os.path.join(_sitemap_folder(), shard_filename(s.id)))]
+
+    for shard in stale:
+        write_shard(shard)
+    if stale or not os.path.exists(index_path):
+        write_index(shards)
+        db.session.commit()
+    return index_path
+
+
+def shard_path(shard_id):
+    """Path of a shard file on disk, regenerating it first if stale"""
+    shard = SitemapShard.query.get(shard_id)
+    if shard is None:
+        return None
+    path = os.path.join(_sitemap_folder(), shard_filename(shard.id))
+    if shard.is_stale or not os.path.exists(path):
+        refresh_sitemaps()
+    return path
@@ -0,0 +1,195 @@
+"""Home timelines with hybrid fan-out.
+
+Posts by ordinary authors are pushed into a ``timeline_entries`` row per
+follower when they are published (fan-out on write), so reading a feed is an
+index range scan. Authors with FEED_FANOUT_THRESHOLD or more followers would
+make that write enormous; their posts are pulled from ``posts`` at read time
+instead and merged into the page (fan-out on read).
+
+An author who drops back below the threshold is marked pending and keeps
+being pulled until ``flask backfill-timelines`` has pushed their recent
+posts to every follower, a batch at a time outside any request.
+"""
+from flask import current_app
+from sqlalchemy import delete, insert, select
+
+from database import db, Follow, Post, TimelineEntry, UserStats
+from utils.view_models import PostSummary, post_summaries
+
+
+def _follower_count(user_id):
+    count = db.session.query(UserStats.follower_count).filter_by(user_id=user_id).scalar()
+    if count is None:
+        count = Follow.query.filter_by(followee_id=user_id).count()
+    return count
+
+
+def fans_out_on_write(user_id):
+    """Whether the author's posts are pushed into follower timelines"""
+    return _follower_count(user_id) < current_app.config['FEED_FANOUT_THRESHOLD']
+
+
+def publish_post(post):
+    """Push a newly published post to its author's followers.
+
+    Returns the number of timeline rows written.
+    """
+    if not fans_out_on_write(post.user_id):
+        return 0
+
+    db.session.flush()
+    result = db.session.execute(insert(TimelineEntry).from_select(
+        ['user_id', 'post_id', 'published_at'],
+        select(Follow.follower_id,
+               db.literal(post.id, db.String),
+               db.literal(post.published_at, db.DateTime))
+        .where(Follow.followee_id == post.user_id)
+    ))
+    return result.rowcount
+
+
+def retract_post(post):
+    """Remove a deleted or unpublished post from every timeline"""
+    db.session.execute(delete(TimelineEntry).where(TimelineEntry.post_id == post.id))
+
+
+def _backfill(author_id, follower_ids):
+    """Copy the author's FEED_BACKFILL most recent posts into follower timelines.
+
+    Covers the given followers of the author; posts already in a timeline
+    are skipped.
+    """
+    recent = select(Post.id, Post.published_at)\
+        .where(Post.user_id == author_id, Post.is_published == True)\
+        .order_by(Post.published_at.desc())\
+        .limit(current_app.config['FEED_BACKFILL'])\
+        .subquery()
+    followers = select(Follow.follower_id, recent.c.id, recent.c.published_at)\
+        .join(recent, db.true()).where(
+        Follow.followee_id == author_id,
+        Follow.follower_id.in_(follower_ids),
+        ~db.exists().where(TimelineEntry.user_id == Follow.follower_id,
+                           TimelineEntry.post_id == recent.c.id)
+    )
+
+    db.session.execute(insert(TimelineEntry).from_select(
+        ['user_id', 'post_id', 'published_at'], followers
+    ))
+
+
+def follow(follower_id, followee_id):
+    """Follow an author and backfill their recent posts into the timeline"""
+    db.session.add(Follow(follower_id=follower_id, followee_id=followee_id))
+    db.session.flush()
+    UserStats.bump(followee_id, follower_count=1)
+
+    if fans_out_on_write(followee_id):
+        _backfill(followee_id, [follower_id])
+
+
+def unfollow(follower_id, followee_id):
+    """Stop following an author and drop their posts from the timeline.
+
+    When this takes the author below FEED_FANOUT_THRESHOLD, the posts
+    published while they were above it were never pushed. Copying them to
+    every remaining follower is too much work for a request, so the author
+    is marked pending for backfill_pending_timelines() instead.
+    """
+    followers_before = _follower_count(followee_id)
+    deleted = Follow.query.filter_by(follower_id=follower_id, followee_id=followee_id)\
+        .delete(synchronize_session=False)
+    if not deleted:
+        return
+
+    UserStats.bump(followee_id, follower_count=-1)
+    db.session.execute(delete(TimelineEntry).where(
+        TimelineEntry.user_id == follower_id,
+        TimelineEntry.post_id.in_(select(Post.id).where(Post.user_id == followee_id))
+    ))
+
+    threshold = current_app.config['FEED_FANOUT_THRESHOLD']
+    if followers_before >= threshold > followers_before - 1:
+        UserStats.query.filter_by(user_id=followee_id).update(
+            {UserStats.timeline_backfill_pending: True}, synchronize_session=False)
+
+
+def backfill_pending_timelines():
+    """Push pending authors' recent posts into their followers' timelines.
+
+    Followers are walked FEED_BACKFILL_BATCH at a time with a commit after
+    each batch. An author's pending flag is cleared only once every batch
+    is done, so an interrupted run resumes from the start. Returns the
+    number of authors processed.
+    """
+    batch_size = current_app.config['FEED_BACKFILL_BATCH']
+    author_ids = [user_id for user_id, in db.session.query(UserStats.user_id)
+                  .filter(UserStats.timeline_backfill_pending == True)]
+
+    for author_id in author_ids:
+        last_follower_id = ''
+        # An author back above the threshold is pulled at read time again
+        while fans_out_on_write(author_id):
+            follower_ids = [follower_id for follower_id, in db.session.query(Follow.follower_id)
+                            .filter(Follow.followee_id == author_id,
+                                    Follow.follower_id > last_follower_id)
+                            .order_by(Follow.follower_id).limit(batch_size)]
+            if not follower_ids:
+                break
+            _backfill(author_id, follower_ids)
+            db.session.commit()
+            last_follower_id = follower_ids[-1]
+
+        UserStats.query.filter_by(user_id=author_id).update(
+            {UserStats.timeline_backfill_pending: False}, synchronize_session=False)
+        db.session.commit()
+
+    return len(author_ids)
+
+
+def _before(query, published_col, id_col, cursor):
+    if cursor is None:
+        return query
+    published_at, post_id = cursor
+    return query.filter(
+        (published_col < published_at) |
+        ((published_col == published_at) & (id_col < post_id))
+    )
+
+
+def feed_page(user_id, cursor=None, per_page=None):
+    """One page of the user's home timeline, newest first.
+
+    ``cursor`` is the (published_at, post_id) of the last post already
+    shown. Returns ``(posts, next_cursor)`` with posts as PostSummary rows;
+    next_cursor is None on the last page.
+    """
+    per_page = per_page or current_app.config['POSTS_PER_PAGE']
+
+    pushed = _before(
+        db.session.query(TimelineEntry.published_at, TimelineEntry.post_id)
+        .filter(TimelineEntry.user_id == user_id),
+        TimelineEntry.published_at, TimelineEntry.post_id, cursor
+    ).order_by(TimelineEntry.published_at.desc(), TimelineEntry.post_id.desc())\
+        .limit(per_page + 1).all()
+
+    high_follower_authors = db.session.query(Follow.followee_id)\
+        .join(UserStats, UserStats.user_id == Follow.followee_id)\
+        .filter(Follow.follower_id == user_id,
+                (UserStats.follower_count >= current_app.config['FEED_FANOUT_THRESHOLD']) |
+                (UserStats.timeline_backfill_pending == True))
+    pulled = _before(
+        db.session.query(Post.published_at, Post.id)
+        .filter(Post.user_id.in_(high_follower_authors), Post.is_published == True),
+        Post.published_at, Post.id, cursor
+    ).order_by(Post.published_at.desc(), Post.id.desc())\
+        .limit(per_page + 1).all()
+
+    # An author who crossed the threshold can appear in both sources
+    keys = sorted(set(map(tuple, pushed)) | set(map(tuple, pulled)), reverse=True)
+    next_cursor = keys[per_page - 1] if len(keys) > per_page else None
+    keys = keys[:per_page]
+
+    posts_by_id = {row.id: PostSummary.from_row(row) for row in
+                   post_summaries().filter(Post.id.in_([post_id for _, post_id in keys]))}
+    posts = [posts_by_id[post_id] for _, post_id in keys if post_id in posts_by_id]
+    return posts, next_cursor
@@ -0,0 +1,93 @@
+"""Read-only rows for listing pages.
+
+Listings only show a post's title, excerpt and counts, so they select those
+columns rather than full ``Post`` entities: the unbounded ``content`` column
+never leaves the database and nothing is added to the session's identity
+map. Like and comment counts come from correlated subqueries, not from
+lazy-loading every like and comment per post.
+"""
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from database import db, User, Post, Comment, Like
+
+PREVIEW_LENGTH = 400  # Body characters fetched when a post has no excerpt
+
+
+class AuthorSummary(NamedTuple):
+    username: str
+    profile_image: Optional[str]
+
+
+class PostSummary(NamedTuple):
+    id: str
+    slug: str
+    title: str
+    excerpt: Optional[str]
+    category: Optional[str]
+    tags: Optional[str]
+    cover_image: Optional[str]
+    is_published: bool
+    views: int
+    created_at: datetime
+    updated_at: datetime
+    published_at: Optional[datetime]
+    like_count: int
+    comment_count: int
+    content_length: int
+    preview: Optional[str]
+    author: AuthorSummary
+
+    @classmethod
+    def from_row(cls, row):
+        values = row._asdict()
+        author = AuthorSummary(values.pop('author_username'), values.pop('author_profile_image'))
+        return cls(author=author, **values)
+
+
+class UserSummary(NamedTuple):
+    id: str
+    username: str
+    email: str
+    profile_image: Optional[str]
+    role: str
+    is_active: bool
+    created_at: datetime
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(**row._asdict())
+
+
+def post_summaries(preview=False):
+    """Query of PostSummary columns; filter/order it, then map rows with from_row"""
+    like_count = db.select(db.func.count(Like.id))\
+        .where(Like.post_id == Post.id).correlate(Post).scalar_subquery()
+    comment_count = db.select(db.func.count(Comment.id))\
+        .where(Comment.post_id == Post.id).correlate(Post).scalar_subquery()
+    preview_column = db.func.substr(Post.content, 1, PREVIEW_LENGTH) if preview else db.null()
+
+    return db.session.query(
+        Post.id, Post.slug, Post.title, Post.excerpt, Post.category, Post.tags,
+        Post.cover_image, Post.is_published, Post.views,
+        Post.created_at, Post.updated_at, Post.published_at,
+        like_count.label('like_count'),
+        comment_count.label('comment_count'),
+        db.func.length(Post.content).label('content_length'),
+        preview_column.label('preview'),
+        User.username.label('author_username'),
+        User.profile_image.label('author_profile_image')
+    ).join(User, User.id == Post.user_id)
+
+
+def user_summaries():
+    """Query of UserSummary columns"""
+    return db.session.query(
+        User.id, User.username, User.email, User.profile_image,
+        User.role, User.is_active, User.created_at
+    )
+
+
+def stream(query, model, batch_size=500):
+    """Map rows to ``model`` lazily, fetching ``batch_size`` rows at a time"""
+    return (model.from_row(row) for row in query.yield_per(batch_size))